@@ -19,14 +19,24 @@ for SNMP subagents in an easy manner. """
 # Helper function courtesy of Alec Thomas and taken from
 # http://stackoverflow.com/questions/36932/how-can-i-represent-an-enum-in-python
 
-from collections import defaultdict
-import sys, os, re, inspect, ctypes, socket, struct
+import sys, os, re, inspect, ctypes
 from threading import Lock
 
 from netsnmpapi import *
 from netsnmpvartypes import _VarType
 import netsnmpvartypes
 
+# net-snmp functions used in hot paths such as request handling and table row
+# manipulation, bound once to save the attribute lookup on the ctypes library
+# objects with every call
+_nsa_call_next_handler           = libnsa.netsnmp_call_next_handler
+_nsa_snmp_varlist_add_variable   = libnsa.snmp_varlist_add_variable
+_nsa_snprint_objid               = libnsa.snprint_objid
+_nsX_create_row_from_defaults    = libnsX.netsnmp_table_data_set_create_row_from_defaults
+_nsX_add_row                     = libnsX.netsnmp_table_dataset_add_row
+_nsX_set_row_column              = libnsX.netsnmp_set_row_column
+_nsX_remove_and_delete_row       = libnsX.netsnmp_table_dataset_remove_and_delete_row
+
 
 def enum(*sequential, **named):
 	enums = dict(zip(sequential, range(len(sequential))), **named)
@@ -49,27 +59,171 @@ netsnmpAgentStatus = enum(
 	"RECONNECTING",  # Got disconnected, trying to reconnect
 )
 
+# Regular expressions used by the custom net-snmp log handler, which gets
+# called for every single log message
+_LOG_STRIP_RE     = re.compile(r"^(Warning|Error): *")
+_LOG_CONNFAIL_RE  = re.compile(r"Failed to .* the agentx master agent")
+_LOG_CONNECTED_RE = re.compile(r"AgentX subagent connected")
+_LOG_DISCONN_RE   = re.compile(r"AgentX master disconnected us")
+
+# Textual descriptions of the log priority levels, indexed by LOG_EMERG (0)
+# to LOG_DEBUG (7)
+_PRIO_NAMES = (
+	"Emergency",  # LOG_EMERG
+	"Alert",      # LOG_ALERT
+	"Critical",   # LOG_CRIT
+	"Error",      # LOG_ERR
+	"Warning",    # LOG_WARNING
+	"Notice",     # LOG_NOTICE
+	"Info",       # LOG_INFO
+	"Debug",      # LOG_DEBUG
+)
 
-def _build_callback_handler(callback):
-	""" Helper function to create callback handler for the net-snmp API """
+# Symbolic OIDs with trailing numeric subidentifiers, eg. instance or index
+# suffixes such as "SNMPv2-MIB::sysUpTime.0", see _prepareOID()
+_OID_SUFFIX_RE = re.compile(r"^(.*[^\d.][^.]*)((?:\.\d+)+)$")
+
+# Maximum number of entries kept in an agent's OID cache
+_OID_CACHE_MAX = 1024
+
+# Textual descriptions of the ASN types of table columns, see Table.value()
+_ASN_TYPE_NAMES = {
+	ASN_INTEGER:    "Integer",
+	ASN_OCTET_STR:  "OctetString",
+	ASN_IPADDRESS:  "IPAddress",
+	ASN_COUNTER:    "Counter32",
+	ASN_COUNTER64:  "Counter64",
+	ASN_UNSIGNED:   "Unsigned32",
+	ASN_TIMETICKS:  "TimeTicks"
+}
+
+# Size of a single OID subidentifier in bytes
+_C_OID_SIZE = ctypes.sizeof(c_oid)
+
+# ASN types of table indexes that are encoded as a single subidentifier
+# holding their (non-negative) value, see Table._rowMatchKey()
+_INT_INDEX_TYPES = frozenset([
+	ASN_INTEGER,
+	ASN_UNSIGNED,
+	ASN_COUNTER,
+	ASN_TIMETICKS
+])
+
+# Helper function to get the dotted decimal representation of an IPv4 address
+# stored as an integer in network byte order, as done by IpAddress objects.
+# Equivalent to socket.inet_ntoa(struct.pack("I", ...)) but avoids building
+# intermediate byte strings. Only the lower 32 bits of "val" are considered.
+if sys.byteorder == "little":
+	def _ipv4_str(val):
+		return "%d.%d.%d.%d" % (
+			val & 0xFF,
+			(val >> 8) & 0xFF,
+			(val >> 16) & 0xFF,
+			(val >> 24) & 0xFF
+		)
+else:
+	def _ipv4_str(val):
+		return "%d.%d.%d.%d" % (
+			(val >> 24) & 0xFF,
+			(val >> 16) & 0xFF,
+			(val >> 8) & 0xFF,
+			val & 0xFF
+		)
 
-	def callback_with_next_handler(handler_p, *args, **kwargs):
+# Helper functions to extract the Python value from the data union "data" of
+# a netsnmp_table_data_set_storage structure, see Table.value()
+def _extract_integer(data, data_len):
+	return data.integer.contents.value
+
+def _extract_octet_str(data, data_len):
+	return u(ctypes.string_at(data.string, data_len))
+
+def _extract_counter64(data, data_len):
+	return data.counter64.contents.value
+
+def _extract_ipaddress(data, data_len):
+	return _ipv4_str(data.integer.contents.value)
+
+# Extractor to use for a particular ASN type. Types not listed here are stored
+# as integers.
+_ASN_VALUE_EXTRACTORS = {
+	ASN_OCTET_STR:  _extract_octet_str,
+	ASN_COUNTER64:  _extract_counter64,
+	ASN_IPADDRESS:  _extract_ipaddress,
+}
+
+# snmp_add_var() type characters for human-readable ASN type names (in lower
+# case), see snmp_pdu._humanToASNtype(). Names are looked up in full first,
+# then by their first three and their first two characters.
+_ADD_VAR_TYPES = {
+	"uinteger":   "3",
+	"gauge":      "u",
+	"unsigned32": "u",
+	"counter64":  "C",
+	"integer":    "i",
+	"integer32":  "i",
+}
+_ADD_VAR_TYPE_PREFIXES = {
+	"hex":        "x",
+	"obj":        "o",
+	"oid":        "o",
+	"dec":        "d",
+	"ip":         "a",
+}
+
+# Varbinds send_trap() puts in front of the trap's own ones
+_SYSUPTIME_OID   = "SNMPv2-MIB::sysUpTime.0"
+_SNMPTRAPOID_OID = "SNMPv2-MIB::snmpTrapOID.0"
+
+# Marker for missing keys in send_trap()'s trap list entries, as opposed to
+# keys present with a value of None
+_MISSING = object()
+
+# The non-private VarType-inheriting classes in the netsnmpvartypes module.
+# They never change at runtime, so determine them once instead of for every
+# netsnmpAgent instance.
+_VARTYPE_CLASSES = [
+	m[1]
+	for m
+	in inspect.getmembers(netsnmpvartypes)
+	if not m[0].startswith("_")
+	and inspect.isclass(m[1])
+	and issubclass(m[1], netsnmpvartypes._VarType)
+]
+
+
+def _build_callback_handler(agent, callback):
+	""" Helper function to create callback handler for the net-snmp API.
+
+	    Handlers are cached per "agent", so registering the same "callback"
+	    for several SNMP objects reuses a single ctypes function pointer. The
+	    cache is keyed on id(callback) so that unhashable callables work, too,
+	    and keeps both the callback and the handler referenced for the agent's
+	    lifetime, which also keeps the callback's id from being reused. """
+
+	entry = agent._handler_cache.get(id(callback))
+	if entry is not None and entry[0] is callback:
+		return entry[1]
+
+	def callback_with_next_handler(handler_p, reginfo_p, reqinfo_p, requests_p):
 		"""
 		Since we are injecting our custom callback _before_ the default helper
 		handlers provided by net-snmp, we need to ensure that when it finishes,
 		it calls the other remaining handlers. This helper function does just
 		that, returning early if the custom handler returned with an error.
+
+		_inject_custom_handler() always places our handler in front of
+		net-snmp's own ones, so there always is a next handler to call.
 		"""
-		ret = callback(handler_p, *args, **kwargs)
+		ret = callback(handler_p, reginfo_p, reqinfo_p, requests_p)
 		if ret != SNMP_ERR_NOERROR:
 			return ret
 
-		if handler_p[0].next is not None:
-			ret = libnsa.netsnmp_call_next_handler(handler_p, *args, **kwargs)
-
-		return ret
+		return _nsa_call_next_handler(handler_p, reginfo_p, reqinfo_p, requests_p)
 
-	return SNMPNodeHandler(callback_with_next_handler)
+	handler = SNMPNodeHandler(callback_with_next_handler)
+	agent._handler_cache[id(callback)] = (callback, handler)
+	return handler
 
 
 def _inject_custom_handler(handler, registration_info):
@@ -83,6 +237,113 @@ def _inject_custom_handler(handler, registration_info):
 		raise netsnmpAgentException("Error injecting custom callback handler!")
 
 
+class snmp_pdu(object):
+	""" clas for handling SNMP PDU objects """
+
+	pdu = None
+
+	def __init__(self, agent, pduType=SNMP_MSG_TRAP2):
+		"""create PDU object for use by "agent" """
+		self.agent = agent
+		self.pdu = libnsX.snmp_pdu_create(pduType)
+
+	def __del__(self):
+		""" destructor """
+		if self.pdu:
+			self.free()
+
+	def free(self):
+		""" free PDU struct """
+		if self.pdu:
+			libnsX.snmp_free_pdu(self.pdu)
+			self.pdu = None
+
+	def variables(self):
+		""" function variables()
+		
+		    return netsnmp_variable_list pointer from PDU
+		"""
+		return self.pdu.contents.variables
+
+	def _humanToASNtype(self, varType):
+		""" convert ASN type name to compatible for snmp_add_var()
+			type char
+			return single char
+		"""
+		# Type chars are passed through as they are, only names need to be
+		# looked up
+		if varType is None:
+			return '='
+		if len(varType) == 1:
+			return varType
+
+		varTypeL = varType.lower()
+		asnType = _ADD_VAR_TYPES.get(varTypeL) \
+		       or _ADD_VAR_TYPE_PREFIXES.get(varTypeL[0:3]) \
+		       or _ADD_VAR_TYPE_PREFIXES.get(varTypeL[0:2])
+		if asnType:
+			return asnType
+		if varType[0] == 'B':
+			return 'b'
+		return varType[0]
+
+	def add(self, varOID, varData, varType='='):
+		"""add OID value to PDU list
+			varType can be any of the following chars:"
+				i for INTEGER, INTEGER32
+				u for UNSIGNED, GAUGE
+				3 for UINTEGER
+				c for COUNTER, COUNTER32
+				C for COUNTER64
+				s for STRING,OCTET_STR
+				x for HEX STRING
+				d for DECIMAL STRING
+				n for NULLOBJ
+				o for OBJID
+				t for TIMETICKS
+				a for IPADDRESS
+				b for BITS
+				= undocumented autodetect feature to get MIB 'SYNTAX' definition
+			varOID may also be an already prepared (c_oid array, c_size_t)
+			tuple as returned by netsnmpAgent._prepareOID()
+		"""
+
+		return self.addVars([(varOID, varData, varType)])[0]
+
+	def addVars(self, varbinds):
+		"""add several OID values to PDU list at once
+			"varbinds" is a sequence of (varOID, varData, varType) tuples
+			as accepted by add()
+			return list of snmp_add_var() results
+		"""
+
+		# Look up everything needed per varbind just once
+		pdu = self.pdu
+		prepareOID = self.agent._prepareOID
+		humanToASNtype = self._humanToASNtype
+		snmp_add_var = libnsX.snmp_add_var
+
+		results = []
+		for (varOID, varData, varType) in varbinds:
+			varType = humanToASNtype(varType)
+
+			if isinstance(varOID, tuple):
+				(varOid, varOidLen) = varOID
+			else:
+				(varOid, varOidLen) = prepareOID(varOID)
+			varData = b(str(varData))
+			ret = snmp_add_var(pdu, varOid, varOidLen.value, b(varType), varData)
+
+			# If the value could not be parsed as the requested type, let
+			# net-snmp fall back to the SYNTAX from the MIB definition
+			if ret and varType != '=':
+				ret = snmp_add_var(pdu, varOid, varOidLen.value, b'=', varData)
+
+			results.append(ret)
+
+		return results
+
+
 class netsnmpAgent(object):
 	""" Implements an SNMP agent using the net-snmp libraries. """
 
@@ -177,23 +438,12 @@ class netsnmpAgent(object):
 			logmsg = ctypes.cast(serverarg, snmp_log_message_p)
 
 			# Generate textual description of priority level
-			priorities = {
-				LOG_EMERG: "Emergency",
-				LOG_ALERT: "Alert",
-				LOG_CRIT: "Critical",
-				LOG_ERR: "Error",
-				LOG_WARNING: "Warning",
-				LOG_NOTICE: "Notice",
-				LOG_INFO: "Info",
-				LOG_DEBUG: "Debug"
-			}
-			msgprio = priorities[logmsg.contents.priority]
+			msgprio = _PRIO_NAMES[logmsg.contents.priority]
 
 			# Strip trailing linefeeds and in addition "Warning: " and "Error: "
 			# from msgtext as these conditions are already indicated through
 			# msgprio
-			msgtext = re.sub(
-				"^(Warning|Error): *",
+			msgtext = _LOG_STRIP_RE.sub(
 				"",
 				u(logmsg.contents.msg.rstrip(b"\n"))
 			)
@@ -203,9 +453,8 @@ class netsnmpAgent(object):
 			# really an ugly hack, introducing a dependency on the particular
 			# text of log messages -- hopefully the net-snmp guys won't
 			# translate them one day.
-			if  msgprio == "Warning" \
-			or  msgprio == "Error" \
-			and re.match("Failed to .* the agentx master agent.*", msgtext):
+			if  (msgprio == "Warning" or msgprio == "Error") \
+			and _LOG_CONNFAIL_RE.match(msgtext):
 				# If this was the first connection attempt, we consider the
 				# condition fatal: it is more likely that an invalid
 				# "MasterSocket" was specified than that we've got concurrency
@@ -222,10 +471,10 @@ class netsnmpAgent(object):
 				# message like any other. net-snmp code will keep retrying to
 				# connect.
 			elif msgprio == "Info" \
-			and  re.match("AgentX subagent connected", msgtext):
+			and  _LOG_CONNECTED_RE.match(msgtext):
 				self._status = netsnmpAgentStatus.CONNECTED
 			elif msgprio == "Info" \
-			and  re.match("AgentX master disconnected us.*", msgtext):
+			and  _LOG_DISCONN_RE.match(msgtext):
 				self._status = netsnmpAgentStatus.RECONNECTING
 
 			# If "LogHandler" was defined, call it to take care of logging.
@@ -355,88 +604,72 @@ class netsnmpAgent(object):
 					raise netsnmpAgentException("netsnmp_read_module({0}) " +
 					                            "failed!".format(mib))
 
-		# Initialize our SNMP object registry
-		self._objs = defaultdict(dict)
-
-		# For each non-private VarType-inheriting class in the netsnmpvartypes
-		# module we dynamically define a class wrapper method in our
-		# netsnmpAgent class which, besides instantiation, sets up a Net-SNMP
-		# watcher for the instance and registers it within our object registry.
-		for vartype_cls in [
-			m[1]
-			for m
-			in inspect.getmembers(sys.modules["netsnmpvartypes"])
-			if not m[0].startswith("_")
-			and inspect.isclass(m[1])
-			and issubclass(m[1], netsnmpvartypes._VarType)
-		]:
-			# Parse the argument specification for the class's __init__ method
-			# to get its default for "initval"
-			argspec = inspect.getargspec(vartype_cls.__init__)
-			default_initval = argspec[3][list(filter(lambda e: e != "self", argspec[0])).index("initval")]
-
-			# Make class wrapper method available in our netsnmpAgent
-			# module under the name of the VarType class
-			cls_wrapper = self._generateVarTypeClassWrapper(vartype_cls, default_initval)
-			setattr(self, vartype_cls.__name__, cls_wrapper)
-
-	def _generateVarTypeClassWrapper(self, vartype_cls, default_initval):
-
-		def _cls_wrapper(initval=default_initval, oidstr=None, writable=True, context="", callback=None):
-			# Get instance of VarType-inheriting class
-			cls_inst = vartype_cls(initval)
-
-			# If an oidstr has been provided, this is a standalone scalar
-			# variable, i.e. it is not used inside a table.
-			if oidstr:
-				cls_inst._callback_handler = None
-				if callback != None:
-					# We defined a Python function that needs a ctypes conversion so it can
-					# be called by C code such as net-snmp. That's what SNMPNodeHandler() is
-					# used for. However we also need to store the reference in "self" as it
-					# will otherwise be lost at the exit of this function so that net-snmp's
-					# attempt to call it would end in nirvana...
-					cls_inst._callback_handler = _build_callback_handler(callback)
-
-				# Prepare the netsnmp_handler_registration structure.
-				cls_inst.handler_reginfo = self._prepareRegistration(oidstr, writable)
-				cls_inst.handler_reginfo.contents.contextName = b(context)
-
-				# Create the netsnmp_watcher_info structure.
-				cls_inst._watcher = libnsX.netsnmp_create_watcher_info(
-					cls_inst.cref(),
-					cls_inst._data_size,
-					cls_inst._asntype,
-					cls_inst._watcher_flags
-				)
-
-				# Explicitly set netsnmp_watcher_info structure's
-				# max_size parameter. netsnmp_create_watcher_info6 would
-				# have done that for us but that function was not yet
-				# available in net-snmp 5.4.x.
-				cls_inst._watcher.contents.max_size = cls_inst._max_size
-
-				# Register handler and watcher with net-snmp.
-				result = libnsX.netsnmp_register_watched_scalar(
-					cls_inst.handler_reginfo,
-					cls_inst._watcher
-				)
-				if result != 0:
-					raise netsnmpAgentException("Error registering variable with net-snmp!")
+		# Initialize our SNMP object registry, keyed by (context, oidstr)
+		self._objs = {}
+
+		# Cache of already parsed OIDs, see _prepareOID()
+		self._oid_cache = {}
+
+		# OIDs send_trap() adds to every trap, prepared on first use, see
+		# _prepareStaticOID()
+		self._static_oids = {}
+
+		# Cache of callback handlers, see _build_callback_handler()
+		self._handler_cache = {}
+
+	def _makeVarType(self, vartype_cls, initval, oidstr, writable, context, callback):
+		""" Implements the VarType class wrapper methods, see
+		    _generateVarTypeMethod(). """
+
+		# Get instance of VarType-inheriting class
+		cls_inst = vartype_cls(initval)
+
+		# If an oidstr has been provided, this is a standalone scalar
+		# variable, i.e. it is not used inside a table.
+		if oidstr:
+			cls_inst._callback_handler = None
+			if callback != None:
+				# We defined a Python function that needs a ctypes conversion so it can
+				# be called by C code such as net-snmp. That's what SNMPNodeHandler() is
+				# used for. However we also need to store the reference in "self" as it
+				# will otherwise be lost at the exit of this function so that net-snmp's
+				# attempt to call it would end in nirvana...
+				cls_inst._callback_handler = _build_callback_handler(self, callback)
+
+			# Prepare the netsnmp_handler_registration structure.
+			cls_inst.handler_reginfo = self._prepareRegistration(oidstr, writable)
+			cls_inst.handler_reginfo.contents.contextName = b(context)
+
+			# Create the netsnmp_watcher_info structure.
+			cls_inst._watcher = libnsX.netsnmp_create_watcher_info(
+				cls_inst.cref(),
+				cls_inst._data_size,
+				cls_inst._asntype,
+				cls_inst._watcher_flags
+			)
 
-				if cls_inst._callback_handler is not None:
-					_inject_custom_handler(cls_inst._callback_handler, cls_inst.handler_reginfo)
+			# Explicitly set netsnmp_watcher_info structure's
+			# max_size parameter. netsnmp_create_watcher_info6 would
+			# have done that for us but that function was not yet
+			# available in net-snmp 5.4.x.
+			cls_inst._watcher.contents.max_size = cls_inst._max_size
 
-				# Finally, we keep track of all registered SNMP objects for the
-				# getRegistered() method.
-				self._objs[context][oidstr] = cls_inst
+			# Register handler and watcher with net-snmp.
+			result = libnsX.netsnmp_register_watched_scalar(
+				cls_inst.handler_reginfo,
+				cls_inst._watcher
+			)
+			if result != 0:
+				raise netsnmpAgentException("Error registering variable with net-snmp!")
 
-			return cls_inst
+			if cls_inst._callback_handler is not None:
+				_inject_custom_handler(cls_inst._callback_handler, cls_inst.handler_reginfo)
 
-		_cls_wrapper.__name__ = vartype_cls.__name__
-		_cls_wrapper.__doc__ = vartype_cls.__doc__
+			# Finally, we keep track of all registered SNMP objects for the
+			# getRegistered() method.
+			self._objs[(context, oidstr)] = cls_inst
 
-		return _cls_wrapper
+		return cls_inst
 
 	def getRawOid(self, mibOid):
 		(oid, oid_len) = self._prepareOID(mibOid)
@@ -448,39 +681,104 @@ class netsnmpAgent(object):
 		    "oidstr" is the oid to read
 		    Return tuple c_oid array and c_size_t length
 		"""
+		# Parsing OIDs through the MIB tree is relatively expensive and the
+		# same OIDs tend to get prepared over and over again, so we keep the
+		# raw results around. Callers always get a fresh array they are free
+		# to modify. The results depend on UseMIBFiles, so it is part of
+		# the cache key.
+		usemibs = self.UseMIBFiles
+		cached = self._oid_cache.get((usemibs, oidstr))
+		suffix = ()
+		if cached is None:
+			# Symbolic OIDs often differ in their numeric suffix only (eg.
+			# table indices), so we cache the symbolic part and append the
+			# suffix ourselves. This also keeps the cache from filling up
+			# with one entry per index.
+			key = oidstr
+			if usemibs:
+				match = _OID_SUFFIX_RE.match(oidstr)
+				if match:
+					key = match.group(1)
+					suffix = match.group(2)[1:].split(".")
+					cached = self._oid_cache.get((usemibs, key))
+
+			if cached is None:
+				try:
+					(oid, oid_len) = self._parseOID(key)
+				except netsnmpAgentException:
+					# Let read_objid() have a go at the full OID, either
+					# it knows better or it fails with a proper message
+					if not suffix:
+						raise
+					(key, suffix) = (oidstr, ())
+					(oid, oid_len) = self._parseOID(key)
+				cached = (ctypes.string_at(oid, ctypes.sizeof(oid)), oid_len.value)
+				if len(self._oid_cache) >= _OID_CACHE_MAX:
+					self._oid_cache.clear()
+				self._oid_cache[(usemibs, key)] = cached
+
+		(oidbytes, oidlen) = cached
+		if not suffix:
+			oid = (c_oid * oidlen).from_buffer_copy(oidbytes)
+			return (oid, ctypes.c_size_t(oidlen))
+
+		# read_objid() would have refused OIDs exceeding MAX_OID_LEN, too
+		fulllen = oidlen + len(suffix)
+		if fulllen > MAX_OID_LEN:
+			raise netsnmpAgentException("read_objid({0}) failed!".format(oidstr))
+
+		oid = (c_oid * fulllen)()
+		ctypes.memmove(oid, oidbytes, len(oidbytes))
+		for i, subid in enumerate(suffix):
+			oid[oidlen + i] = int(subid)
+		return (oid, ctypes.c_size_t(fulllen))
+
+	def _prepareStaticOID(self, oidstr):
+		""" Like _prepareOID() but hands out the same c_oid array for every
+		    call with the same "oidstr", so callers must not modify it.
+		    Meant for the few OIDs that get used over and over again. """
+		prepared = self._static_oids.get(oidstr)
+		if prepared is None:
+			prepared = self._prepareOID(oidstr)
+			self._static_oids[oidstr] = prepared
+		return prepared
+
+	def _parseOID(self, oidstr):
+		""" Parses "oidstr" without consulting the OID cache.
+		    Return tuple c_oid array and c_size_t length
+		"""
 		if self.UseMIBFiles:
 			# We can't know the length of the internal OID representation
 			# beforehand, so we use a MAX_OID_LEN sized buffer for the call to
-			# read_objid() below
-			oid = (c_oid * MAX_OID_LEN)()
-			oid_len = ctypes.c_size_t(MAX_OID_LEN)
+			# read_objid() below. It must not be shared between calls since
+			# ctypes releases the GIL while read_objid() writes to it and OIDs
+			# may get prepared from several threads (eg. send_trap()).
+			buf = (c_oid * MAX_OID_LEN)()
+			buf_len = ctypes.c_size_t(MAX_OID_LEN)
 
 			# Let libsnmpagent parse the OID
 			if libnsa.read_objid(
 				b(oidstr),
-				ctypes.cast(ctypes.byref(oid), c_oid_p),
-				ctypes.byref(oid_len)
+				buf,
+				ctypes.byref(buf_len)
 			) == 0:
 				raise netsnmpAgentException("read_objid({0}) failed!".format(oidstr))
 
-			# trim trailing zeroes in oid array
-			trimOID = c_oid * oid_len.value
-			oid = trimOID(*oid[0:oid_len.value])
+			# Copy out the used part of the buffer only
+			oid = (c_oid * buf_len.value).from_buffer_copy(buf)
+			oid_len = ctypes.c_size_t(buf_len.value)
 		else:
-			# Interpret the given oidstr as the oid itself.
+			# Interpret the given oidstr as the oid itself. Assigning the
+			# subidentifiers to the array directly saves creating a c_oid
+			# object for each of them.
+			parts = oidstr.split('.')
+			oid = (c_oid * len(parts))()
 			try:
-				# The error on this line was annoying
-				# parts = [c_oid(long(x) if sys.version_info <= (3,) else int(x)) for x in oidstr.split('.')]
-				if sys.version_info <= (3,):
-
-					def long(obj):
-						return int(obj)
-
-				parts = [c_oid(long(x)) for x in oidstr.split('.')]
+				for i, part in enumerate(parts):
+					oid[i] = int(part)
 			except ValueError:
 				raise netsnmpAgentException("Invalid OID (not using MIB): {0}".format(oidstr))
 
-			oid = (c_oid * len(parts))(*parts)
 			oid_len = ctypes.c_size_t(len(parts))
 
 		return (oid, oid_len)
@@ -530,7 +828,11 @@ class netsnmpAgent(object):
 					ctypes.c_char_p(b(oidstr))
 				)
 
-				# Define the table row's indexes
+				# Define the table row's indexes. For tables with a single
+				# index we remember its type so _rowMatchKey() can decode
+				# the row identifiers itself.
+				self._idxasntype = idxobjs[0]._asntype if len(idxobjs) == 1 \
+				                                       else None
 				for idxobj in idxobjs:
 					libnsX.netsnmp_table_dataset_add_index(
 						self._dataset,
@@ -565,7 +867,7 @@ class netsnmpAgent(object):
 					# used for. However we also need to store the reference in "self" as it
 					# will otherwise be lost at the exit of this function so that net-snmp's
 					# attempt to call it would end in nirvana...
-					self._callback_handler = _build_callback_handler(callback)
+					self._callback_handler = _build_callback_handler(agent, callback)
 
 				self._handler_reginfo = agent._prepareRegistration(oidstr, extendable)
 				self._handler_reginfo.contents.contextName = b(context)
@@ -585,9 +887,48 @@ class netsnmpAgent(object):
 						"net-snmp!".format(result)
 					)
 
+				# snprint_objid() in _getIndices() requires a _full_ OID whereas
+				# the table rows contain only their own identifiers.
+				# Unfortunately, net-snmp does not have a ready function to get
+				# the full OID. The following code was modelled after similar
+				# code in netsnmp_table_data_build_result(). Since everything
+				# preceding the row identifier is the same for all rows, we
+				# prepare it once. It is kept as an immutable byte string that
+				# gets copied into a buffer of its own for each row since
+				# _getIndices() may be called from several threads at once.
+				rootoidlen = self._handler_reginfo.contents.rootoid_len
+				oidprefix = (c_oid * (rootoidlen + 2))()
+
+				# Registered OID
+				ctypes.memmove(
+					oidprefix,
+					self._handler_reginfo.contents.rootoid,
+					rootoidlen * ctypes.sizeof(c_oid)
+				)
+
+				# Entry
+				oidprefix[rootoidlen] = 1
+
+				# Fake the column number. Unlike the table_data and
+				# table_data_set handlers, we do not have one here. No
+				# biggie, using a fixed value will do for our purposes as
+				# we'll do away with anything left of the first dot in
+				# _getIndices().
+				oidprefix[rootoidlen + 1] = 2
+
+				self._oidprefix = ctypes.string_at(oidprefix, ctypes.sizeof(oidprefix))
+				self._oidprefixlen = rootoidlen + 2
+
 				# Finally, we keep track of all registered SNMP objects for the
 				# getRegistered() method.
-				agent._objs[context][oidstr] = self
+				agent._objs[(context, oidstr)] = self
+
+				# Cache mapping the (stringified) indices of rows to the rows
+				# themselves, see _findRow(). Rows of extendable tables can
+				# not be cached: net-snmp replaces a row with a modified copy
+				# when it gets changed through SNMP SET requests, which would
+				# leave us with dangling pointers.
+				self._rowIndex = None if extendable else {}
 
 				# If "counterobj" was specified, use it to track the number
 				# of table rows
@@ -595,6 +936,54 @@ class netsnmpAgent(object):
 					counterobj.update(0)
 				self._counterobj = counterobj
 
+			# Define a Python class to provide access to the table rows. It is
+			# defined once per table instead of once per added row, keeping class
+			# creation out of the addRow() path.
+			class TableRow(object):
+
+				def __init__(self, dataset, idxobjs):
+					# Create the netsnmp_table_set_storage structure for
+					# this row.
+					self._table_row = _nsX_create_row_from_defaults(
+						dataset.contents.default_row
+					)
+
+					# Add the indexes. byref() suffices for the
+					# netsnmp_variable_list ** argument and is cheaper than
+					# creating a full pointer object.
+					indexes_pp = ctypes.byref(self._table_row.contents.indexes)
+					for idxobj in idxobjs:
+						result = _nsa_snmp_varlist_add_variable(
+							indexes_pp,
+							None,
+							0,
+							idxobj._asntype,
+							idxobj.cref(is_table_index=True),
+							idxobj._data_size
+						)
+						if result == None:
+							raise netsnmpAgentException("snmp_varlist_add_variable() failed!")
+
+				@classmethod
+				def _fromExistingRow(cls, row):
+					if not row:
+						raise netsnmpAgentException('Row not found!')
+
+					tableRow = cls.__new__(cls)
+					tableRow._table_row = row
+					return tableRow
+
+				def setRowCell(self, column, snmpobj):
+					result = _nsX_set_row_column(
+						self._table_row,
+						column,
+						snmpobj._asntype,
+						snmpobj.cref(),
+						snmpobj._data_size
+					)
+					if result != SNMPERR_SUCCESS:
+						raise netsnmpAgentException("netsnmp_set_row_column() failed with error code {0}!".format(result))
+
 			def getRow(self, idxobjs):
 				'''Return existing TableRow in Table'''
 				return self._getOrAddRow(idxobjs, _getExistingRow=True)
@@ -603,64 +992,48 @@ class netsnmpAgent(object):
 				'''Return a new TableRow in Table'''
 				return self._getOrAddRow(idxobjs)
 
-			def _getOrAddRow(self, idxobjs, _getExistingRow=False):
-				'''Return a new or existing TableRow in Table.
-				This was the original "getRow" method before the addition of "getRow".'''
-				dataset = self._dataset
+			def addRows(self, idxobjs_list):
+				'''Return a list of new TableRows in Table, one for each
+				sequence of index objects in "idxobjs_list".
 
-				# Define a Python class to provide access to the table row.
-				class TableRow(object):
+				Equivalent to calling addRow() for each entry but cheaper for
+				large numbers of rows as the counter object, if any, is only
+				updated once at the end. Just like with repeated addRow()
+				calls, each row is added to the table as soon as it has been
+				built, so if building a row fails, the rows preceding it stay
+				in the table (and are accounted for in the counter object).'''
+				dataset = self._dataset
+				TableRow = self.TableRow
+				add_row = _nsX_add_row
+				cache_row = self._cacheRow
 
-					def __init__(self, idxobjs):
-						# Create the netsnmp_table_set_storage structure for
-						# this row.
-						self._table_row = libnsX.netsnmp_table_data_set_create_row_from_defaults(
-							dataset.contents.default_row
-						)
+				rows = []
+				try:
+					for idxobjs in idxobjs_list:
+						row = TableRow(dataset, idxobjs)
+						add_row(dataset, row._table_row)
+						cache_row(row._table_row)
+						rows.append(row)
+				finally:
+					if self._counterobj and rows:
+						self._counterobj.update(self._counterobj.value() + len(rows))
 
-						# Add the indexes
-						for idxobj in idxobjs:
-							result = libnsa.snmp_varlist_add_variable(
-								ctypes.pointer(self._table_row.contents.indexes),
-								None,
-								0,
-								idxobj._asntype,
-								idxobj.cref(is_table_index=True),
-								idxobj._data_size
-							)
-							if result == None:
-								raise netsnmpAgentException("snmp_varlist_add_variable() failed!")
-
-					@classmethod
-					def _fromExistingRow(cls, row):
-						if not bool(row):
-							raise netsnmpAgentException('Row not found!')
-
-						tableRow = cls.__new__(cls)
-						tableRow._table_row = row
-						return tableRow
-
-					def setRowCell(self, column, snmpobj):
-						result = libnsX.netsnmp_set_row_column(
-							self._table_row,
-							column,
-							snmpobj._asntype,
-							snmpobj.cref(),
-							snmpobj._data_size
-						)
-						if result != SNMPERR_SUCCESS:
-							raise netsnmpAgentException("netsnmp_set_row_column() failed with error code {0}!".format(result))
+				return rows
 
+			def _getOrAddRow(self, idxobjs, _getExistingRow=False):
+				'''Return a new or existing TableRow in Table.
+				This was the original "getRow" method before the addition of "getRow".'''
 				# I don't like this aproach, but without some refactoring, this get's me an existing TableRow
 				if _getExistingRow:
-					return TableRow._fromExistingRow(self._getRow(idxobjs))
+					return self.TableRow._fromExistingRow(self._getRow(idxobjs))
 
-				row = TableRow(idxobjs)
+				row = self.TableRow(self._dataset, idxobjs)
 
-				libnsX.netsnmp_table_dataset_add_row(
-					dataset,  # *table
+				_nsX_add_row(
+					self._dataset,  # *table
 					row._table_row  # row
 				)
+				self._cacheRow(row._table_row)
 
 				if self._counterobj:
 					self._counterobj.update(self._counterobj.value() + 1)
@@ -676,38 +1049,25 @@ class netsnmpAgent(object):
 				# The first entry will contain the defined columns, their types
 				# and their defaults, if set. We use array index 0 since it's
 				# impossible for SNMP tables to have a row with that index.
-				retdict[0] = {}
+				coldefs = retdict[0] = {}
 				col = self._dataset.contents.default_row
-				while bool(col):
-					retdict[0][int(col.contents.column)] = {}
-
-					asntypes = {
-						ASN_INTEGER:    "Integer",
-						ASN_OCTET_STR:  "OctetString",
-						ASN_IPADDRESS:  "IPAddress",
-						ASN_COUNTER:    "Counter32",
-						ASN_COUNTER64:  "Counter64",
-						ASN_UNSIGNED:   "Unsigned32",
-						ASN_TIMETICKS:  "TimeTicks"
-					}
-					retdict[0][int(col.contents.column)]["type"] = asntypes[col.contents.type]
-					if bool(col.contents.data):
-						if col.contents.type == ASN_OCTET_STR:
-							retdict[0][int(col.contents.column)]["value"] = u(ctypes.string_at(col.contents.data.string, col.contents.data_len))
-						elif col.contents.type == ASN_IPADDRESS:
-							uint_value = ctypes.cast(
-								(ctypes.c_int * 1)(col.contents.data.integer.contents.value),
-								ctypes.POINTER(ctypes.c_uint)
-							).contents.value
-							retdict[0][int(col.contents.column)]["value"] = socket.inet_ntoa(struct.pack("I", uint_value))
-						else:
-							retdict[0][int(col.contents.column)]["value"] = col.contents.data.integer.contents.value
-					col = col.contents.next
+				while col:
+					# Dereference each structure only once, every attribute
+					# access through ctypes creates a new Python object
+					c = col.contents
+					cdata = c.data
+
+					coltype = c.type
+					coldef = coldefs[int(c.column)] = {"type": _ASN_TYPE_NAMES[coltype]}
+					if cdata.voidp:
+						extract = _ASN_VALUE_EXTRACTORS.get(coltype, _extract_integer)
+						coldef["value"] = extract(cdata, c.data_len)
+					col = c.next
 
 				# Next we iterate over the table's rows, creating a dictionary
 				# entry for each row after that row's index.
 				row = self._dataset.contents.table.contents.first_row
-				while bool(row):
+				while row:
 					# We want to return the row index in the same way it is
 					# shown when using "snmptable", eg. "aa" instead of 2.97.97.
 					# This conversion is actually quite complicated (see
@@ -717,89 +1077,77 @@ class netsnmpAgent(object):
 					# not changed.
 
 					indices = self._getIndices(row)
-					# print("in value(), indices={}".format(indices))
+					r = row.contents
 
 					# Finally, iterate over all columns for this row and add
 					# stored data, if present
-					retdict[indices] = {}
-					data = ctypes.cast(row.contents.data, ctypes.POINTER(netsnmp_table_data_set_storage))
-					while bool(data):
-						if bool(data.contents.data):
-							if data.contents.type == ASN_OCTET_STR:
-								retdict[indices][int(data.contents.column)] = u(ctypes.string_at(data.contents.data.string, data.contents.data_len))
-							elif data.contents.type == ASN_COUNTER64:
-								retdict[indices][int(data.contents.column)] = data.contents.data.counter64.contents.value
-							elif data.contents.type == ASN_IPADDRESS:
-								uint_value = ctypes.cast((ctypes.c_int * 1)(
-									data.contents.data.integer.contents.value),
-									ctypes.POINTER(ctypes.c_uint)
-									).contents.value
-								retdict[indices][int(data.contents.column)] = socket.inet_ntoa(struct.pack("I", uint_value))
-							else:
-								retdict[indices][int(data.contents.column)] = data.contents.data.integer.contents.value
-						else:
-							retdict[indices] += {}
-						data = data.contents.next
-
-					row = row.contents.next
+					rowdict = retdict[indices] = {}
+					data = ctypes.cast(r.data, netsnmp_table_data_set_storage_p)
+					while data:
+						d = data.contents
+						ddata = d.data
+						if ddata.voidp:
+							extract = _ASN_VALUE_EXTRACTORS.get(d.type, _extract_integer)
+							rowdict[int(d.column)] = extract(ddata, d.data_len)
+						data = d.next
+
+					row = r.next
 
 				return retdict
 
 			def clear(self):
 				row = self._dataset.contents.table.contents.first_row
-				while bool(row):
-					nextrow = row.contents.next
-					libnsX.netsnmp_table_dataset_remove_and_delete_row(
+				while row:
+					# "row.contents.next" shares its memory with the row we are
+					# about to free, so keep a copy of the pointer
+					nextrow = ctypes.cast(row.contents.next, netsnmp_table_row_p)
+					_nsX_remove_and_delete_row(
 						self._dataset,
 						row
 					)
 					row = nextrow
+				if self._rowIndex is not None:
+					self._rowIndex.clear()
 				if self._counterobj:
 					self._counterobj.update(0)
 
 			# Return the indices of the specified row as a dotted string.
 			def _getIndices(self, row):
-				if not bool(row):
+				if not row:
 					return None
 
-				# snprint_objid() below requires a _full_ OID whereas the
-				# table row contains only the current row's identifer.
-				# Unfortunately, net-snmp does not have a ready function to
-				# get the full OID. The following code was modelled after
-				# similar code in netsnmp_table_data_build_result().
-				fulloid = ctypes.cast(
-					ctypes.create_string_buffer(
-						MAX_OID_LEN * ctypes.sizeof(c_oid)
-					),
-					c_oid_p
+				# Dereference the row only once, every attribute access
+				# through ctypes creates a new Python object
+				r = row.contents
+				index_oid = r.index_oid
+				indexoidlen = r.index_oid_len
+
+				# Index data, appended to the prepared registered OID prefix.
+				# Both buffers are allocated per call: ctypes releases the GIL
+				# during memmove() and snprint_objid(), so buffers shared by
+				# all calls could get mixed up between threads.
+				oidprefix = self._oidprefix
+				fulloidlen = self._oidprefixlen + indexoidlen
+				if fulloidlen > MAX_OID_LEN:
+					raise netsnmpAgentException(
+						"Row index of {0} subidentifiers exceeds "
+						"MAX_OID_LEN!".format(indexoidlen)
+					)
+				fulloid = (c_oid * fulloidlen)()
+				ctypes.memmove(fulloid, oidprefix, len(oidprefix))
+				ctypes.memmove(
+					ctypes.addressof(fulloid) + len(oidprefix),
+					index_oid,
+					indexoidlen * _C_OID_SIZE
 				)
 
-				# Registered OID
-				rootoidlen = self._handler_reginfo.contents.rootoid_len
-				for i in range(0, rootoidlen):
-					fulloid[i] = self._handler_reginfo.contents.rootoid[i]
-
-				# Entry
-				fulloid[rootoidlen] = 1
-
-				# Fake the column number. Unlike the table_data and
-				# table_data_set handlers, we do not have one here. No
-				# biggie, using a fixed value will do for our purposes as
-				# we'll do away with anything left of the first dot below.
-				fulloid[rootoidlen + 1] = 2
-
-				# Index data
-				indexoidlen = row.contents.index_oid_len
-				for i in range(0, indexoidlen):
-					fulloid[rootoidlen + 2 + i] = row.contents.index_oid[i]
-
 				# Convert the full OID to its string representation
 				oidcstr = ctypes.create_string_buffer(MAX_OID_LEN)
-				libnsa.snprint_objid(
+				_nsa_snprint_objid(
 					oidcstr,
 					MAX_OID_LEN,
 					fulloid,
-					rootoidlen + 2 + indexoidlen
+					fulloidlen
 				)
 
 				# And finally do away with anything left of the first dot
@@ -815,25 +1163,121 @@ class netsnmpAgent(object):
 
 				return indices
 
-			def _getRow(self, indices=[]):
-				'''Returns a NET-SNMP row.'''
+			def _rowMatchKey(self, row):
+				'''Returns the string _rowKey() would produce for the indices
+				of "row", as used by _findRow() to match rows.'''
+				# Single integer and string indexes are trivially encoded in
+				# the row identifier, so we can decode them ourselves without
+				# going through snprint_objid(). Unlike _getIndices(), and thus
+				# value(), this ignores enumerations and display hints from
+				# the MIB, which is what we want when comparing against the
+				# plain values getRow() & co. get passed. Strings qualify only
+				# if they are made up of characters printed verbatim.
+				idxasntype = self._idxasntype
+				if idxasntype is not None and row:
+					r = row.contents
+					index_oid = r.index_oid
+					indexoidlen = r.index_oid_len
+					if idxasntype in _INT_INDEX_TYPES:
+						if indexoidlen == 1 and \
+						   (idxasntype != ASN_INTEGER or index_oid[0] <= 0x7FFFFFFF):
+							return str(index_oid[0])
+					elif idxasntype == ASN_OCTET_STR:
+						if indexoidlen > 0 and index_oid[0] == indexoidlen - 1:
+							chars = index_oid[1:indexoidlen]
+							if all(0x20 <= c < 0x7F and c not in (0x22, 0x5C) for c in chars):
+								return u(bytes(bytearray(chars)))
+
+				return str(self._getIndices(row))
+
+			def _cacheRow(self, row):
+				'''Adds the just added NET-SNMP "row" to the row cache, if
+				the table has one, so looking it up does not cause a miss.'''
+				rowIndex = self._rowIndex
+				if rowIndex is not None:
+					rowIndex.setdefault(
+						self._rowMatchKey(row),
+						ctypes.cast(row, netsnmp_table_row_p)
+					)
+
+			def _rowKey(self, indices):
+				'''Returns the string _findRow() matches rows against.'''
 				if not isinstance(indices, list):
 					indices = [indices]
-				if isinstance(indices[0], _VarType):
-# 					matchStr = 	'.'.join(str(u(x._cvar.value)) for x in indices)
-					# FIXME:  make this robust in case index is string or IP
-					matchStr = 	'.'.join(str(x._cvar.value) for x in indices)
-				else:
-					matchStr = 	'.'.join(str(x) for x in indices)
+				# Use the value() of SNMP objects, decoding byte strings (eg.
+				# from OctetString objects) so string indexes compare equal
+				# to what _rowMatchKey() returns
+				# FIXME: IpAddress indexes still do not match
+				parts = []
+				for x in indices:
+					if isinstance(x, _VarType):
+						x = x.value()
+					if isinstance(x, bytes):
+						x = u(x)
+					parts.append(str(x))
+				matchStr = ".".join(parts)
+
+				return matchStr
 
+			def _getRow(self, indices=[]):
+				'''Returns a NET-SNMP row.'''
+				# Uncached tables with a single integer index can be walked
+				# comparing the raw row identifiers, without decoding them
+				if  self._rowIndex is None \
+				and self._idxasntype in _INT_INDEX_TYPES \
+				and isinstance(indices, int) and not isinstance(indices, bool) \
+				and 0 <= indices <= 0x7FFFFFFF:
+					row = self._dataset.contents.table.contents.first_row
+					while row:
+						r = row.contents
+						if r.index_oid_len == 1 and r.index_oid[0] == indices:
+							break
+						row = r.next
+
+					# "row" shares its memory with the previous row's "next"
+					# field (or the table's "first_row"), so return a copy of
+					# the pointer that stays valid when the list changes
+					return ctypes.cast(row, netsnmp_table_row_p)
+
+				return self._findRow(self._rowKey(indices))
+
+			def _findRow(self, matchStr):
+				'''Returns the NET-SNMP row whose indices match "matchStr" or
+				a NULL pointer if there is none.'''
+				rowIndex = self._rowIndex
+				if rowIndex is None:
+					# Uncached table, walk the rows until we find a match
+					rowMatchKey = self._rowMatchKey
+					row = self._dataset.contents.table.contents.first_row
+					while row and matchStr != rowMatchKey(row):
+						row = row.contents.next
+
+					# "row" shares its memory with the previous row's "next"
+					# field, so return a copy of the pointer
+					return ctypes.cast(row, netsnmp_table_row_p)
+
+				row = rowIndex.get(matchStr)
+				if row is not None:
+					return row
+
+				# Cache miss, eg. because the row was added after the cache
+				# was last built. Walk the whole table to rebuild the cache.
+				rowIndex.clear()
+				found = netsnmp_table_row_p()
+				rowMatchKey = self._rowMatchKey
 				row = self._dataset.contents.table.contents.first_row
-				rowIndices = self._getIndices(row)
-
-				while bool(row) and matchStr != rowIndices:
+				while row:
+					# "row" shares its memory with the previous row's "next"
+					# field, so store a copy of the pointer
+					row = ctypes.cast(row, netsnmp_table_row_p)
+					rowIndices = rowMatchKey(row)
+					if rowIndices not in rowIndex:
+						rowIndex[rowIndices] = row
+						if rowIndices == matchStr:
+							found = row
 					row = row.contents.next
-					rowIndices = self._getIndices(row)
 
-				return row
+				return found
 
 			def setRowColumn(self, indices, colIdx, snmpobj):
 				'''This method was added to address a table row memory error.
@@ -851,10 +1295,10 @@ class netsnmpAgent(object):
 				TableRow.setRowCell().
 				'''
 				row = self._getRow(indices)
-				if not bool(row):
+				if not row:
 					raise netsnmpAgentException("setRowColumn() failed to find row for indices {0}!".format(indices))
 
-				result = libnsX.netsnmp_set_row_column(
+				result = _nsX_set_row_column(
 					row,
 					colIdx,
 					snmpobj._asntype,
@@ -865,9 +1309,15 @@ class netsnmpAgent(object):
 					raise netsnmpAgentException("netsnmp_set_row_column() failed with error code {0}!".format(result))
 
 			def deleteRow(self, indices):
-				row = self._getRow(indices)
-				if bool(row):
-					libnsX.netsnmp_table_dataset_remove_and_delete_row(
+				if self._rowIndex is None:
+					row = self._getRow(indices)
+				else:
+					matchStr = self._rowKey(indices)
+					row = self._findRow(matchStr)
+					if row:
+						del self._rowIndex[matchStr]
+				if row:
+					_nsX_remove_and_delete_row(
 						self._dataset,
 						row
 					)
@@ -880,26 +1330,25 @@ class netsnmpAgent(object):
 	def getContexts(self):
 		""" Returns the defined contexts. """
 
-		return self._objs.keys()
+		contexts = []
+		for (context, oidstr) in self._objs:
+			if context not in contexts:
+				contexts.append(context)
+		return contexts
 
 	def getRegistered(self, context=""):
 		""" Returns a dictionary with the currently registered SNMP objects.
 
 		    Returned is a dictionary objects for the specified "context",
 		    which defaults to the default context. """
-		myobjs = {}
-		try:
-			# Python 2.x
-			objs_iterator = self._objs[context].iteritems()
-		except AttributeError:
-			# Python 3.x
-			objs_iterator = self._objs[context].items()
-		for oidstr, snmpobj in objs_iterator:
-			myobjs[oidstr] = {
+		return {
+			oidstr: {
 				"type": type(snmpobj).__name__,
 				"value": snmpobj.value()
 			}
-		return dict(myobjs)
+			for (objcontext, oidstr), snmpobj in self._objs.items()
+			if objcontext == context
+		}
 
 	def start(self):
 		""" Starts the agent. Among other things, this means connecting
@@ -918,7 +1367,7 @@ class netsnmpAgent(object):
 		""" Processes incoming SNMP requests.
 		    If optional "block" argument is True (default), the function
 		    will block until a SNMP packet is received. """
-		return libnsa.agent_check_and_process(int(bool(block)))
+		return libnsa.agent_check_and_process(1 if block else 0)
 
 	def shutdown(self):
 		libnsa.snmp_shutdown(b(self.AgentName))
@@ -981,104 +1430,6 @@ class netsnmpAgent(object):
 				)
 		'''
 
-		agent = self
-
-		class snmp_pdu(object):
-			""" clas for handling SNMP PDU objects """
-
-			pdu = None
-
-			def __init__(self, pduType=SNMP_MSG_TRAP2):
-				"""create PDU object """
-				self.pdu = libnsX.snmp_pdu_create(SNMP_MSG_TRAP2)
-
-			def __del__(self):
-				""" destructor """
-				if self.pdu:
-					self.free()
-
-			def free(self):
-				""" free PDU struct """
-				if self.pdu:
-					libnsX.snmp_free_pdu(self.pdu)
-					self.pdu = None
-
-			def variables(self):
-				""" function variables()
-				
-				    return netsnmp_variable_list pointer from PDU
-				"""
-				return self.pdu.contents.variables
-
-			def _humanToASNtype(self, varType):
-				""" convert ASN type name to compatible for snmp_add_var()
-					type char
-					return single char
-				"""
-				if varType == None:
-					varType = '='
-				if len(varType) > 1:
-					varTypeL = varType.lower()
-					if varTypeL[0:3] == 'hex':
-						varType = 'x'
-					elif varTypeL[0:3] in ('obj', 'oid'):
-						varType = 'o'
-					elif varTypeL[0:4] == 'uinteger':
-						varType = '3'
-					elif varTypeL in ('gauge', 'unsigned32'):
-						varType = 'u'
-					elif varTypeL[0:2] == 'ip':
-						varType = 'a'
-					elif varTypeL[0:3] == 'dec':
-						varType = 'd'
-					elif varTypeL == 'counter64':
-						varType = 'C'
-					elif varTypeL in ('integer', 'integer32'):
-						varType = 'i'
-					elif varType[0] == 'B':
-						varType = 'b'
-				return varType[0]
-
-			def add(self, varOID, varData, varType='='):
-				"""add OID value to PDU list
-					varType can be any of the following chars:"
-						i for INTEGER, INTEGER32
-						u for UNSIGNED, GAUGE
-						3 for UINTEGER
-						c for COUNTER, COUNTER32
-						C for COUNTER64
-						s for STRING,OCTET_STR
-						x for HEX STRING
-						d for DECIMAL STRING
-						n for NULLOBJ
-						o for OBJID
-						t for TIMETICKS
-						a for IPADDRESS
-						b for BITS
-						= undocumented autodetect feature to get MIB 'SYNTAX' definition
-				"""
-
-				varType = self._humanToASNtype(varType)
-
-				(varOid, varOidLen) = agent._prepareOID(varOID)
-				ret = 255
-				while ret:
-					ret = libnsX.snmp_add_var(
-							self.pdu,
-							ctypes.cast(ctypes.byref(varOid), c_oid_p),
-							varOidLen.value,
-							ctypes.c_char(b(varType)),
-							ctypes.c_char_p(b('{0}'.format(varData)))
-					)
-					if ret != 0:
-						if varType != '=':
-							varType = '='
-							print("ZDBG: ret={0}".format(ret))
-						else:
-							break
-
-				return ret
-
 		trap = kwargs.get('trap')
 		specific = kwargs.get('specific')
 		oid = kwargs.get('oid')
@@ -1088,12 +1439,12 @@ class netsnmpAgent(object):
 
 		if oid:
 			# send itrap SNMPv2 or SNMPv3
-			pdu = snmp_pdu()
+			pdu = snmp_pdu(self)
 
 			if uptime:
-				pdu.add('SNMPv2-MIB::sysUpTime.0', uptime, 't')
+				pdu.add(self._prepareStaticOID(_SYSUPTIME_OID), uptime, 't')
 
-			result = pdu.add('SNMPv2-MIB::snmpTrapOID.0', oid)
+			result = pdu.add(self._prepareStaticOID(_SNMPTRAPOID_OID), oid)
 			if result != 0:
 				msg = "Failed to add {0} as snmpTrapOID!".format(oid)
 				raise netsnmpAgentException(msg)
@@ -1101,21 +1452,18 @@ class netsnmpAgent(object):
 				# add traps
 				if traps == None:
 					traps = []
+				varbinds = []
 				for entry in traps:
-					if ('oid' in entry):
-						varOid = entry['oid']
-						if ('val' in entry):
-							varData = entry['val']
-							varType = None
-							if ('type' in entry):
-								varType = entry['type']
-							pdu.add(varOid, varData, varType)
-						else:
-							msg = "missing 'val' key in trap list!"
-							raise netsnmpAgentException(msg)
-					else:
+					varOid = entry.get('oid', _MISSING)
+					if varOid is _MISSING:
 						msg = "missing 'oid' key in trap list!"
 						raise netsnmpAgentException(msg)
+					varData = entry.get('val', _MISSING)
+					if varData is _MISSING:
+						msg = "missing 'val' key in trap list!"
+						raise netsnmpAgentException(msg)
+					varbinds.append((varOid, varData, entry.get('type')))
+				pdu.addVars(varbinds)
 
 				variables = pdu.variables()
 				if context:
@@ -1129,14 +1477,36 @@ class netsnmpAgent(object):
 					libnsa.send_v2trap(variables)
 		else:
 			# send easy trap
-			if trap and specific:
-				trap = ctypes.c_int(trap)
-				specific = ctypes.c_int(specific)
-			elif len(args) == 2 and type(args[0]) == int and type(args[1]) == int:
-				trap = ctypes.c_int(args[0])
-				specific = ctypes.c_int(args[1])
+			# Both arguments are converted according to send_easy_trap()'s
+			# argtypes, no need to wrap them into ctypes objects ourselves
+			if trap is None and specific is None and len(args) == 2:
+				(trap, specific) = args
 			libnsa.send_easy_trap(trap, specific)
 
 
+def _generateVarTypeMethod(vartype_cls):
+	""" Returns a netsnmpAgent method named after "vartype_cls" which, besides
+	    instantiation, sets up a Net-SNMP watcher for the instance and
+	    registers it within the agent's object registry. """
+
+	default_initval = vartype_cls._default_initval
+
+	def _cls_wrapper(self, initval=default_initval, oidstr=None, writable=True, context="", callback=None):
+		return self._makeVarType(vartype_cls, initval, oidstr, writable, context, callback)
+
+	_cls_wrapper.__name__ = vartype_cls.__name__
+	_cls_wrapper.__doc__ = vartype_cls.__doc__
+
+	return _cls_wrapper
+
+# For each non-private VarType-inheriting class in the netsnmpvartypes module
+# we define a class wrapper method in our netsnmpAgent class. Doing this once
+# on the class instead of in netsnmpAgent.__init__() saves every instance
+# from carrying its own set of wrapper closures.
+for _vartype_cls in _VARTYPE_CLASSES:
+	setattr(netsnmpAgent, _vartype_cls.__name__, _generateVarTypeMethod(_vartype_cls))
+del _vartype_cls
+
+
 class netsnmpAgentException(Exception):
 	pass
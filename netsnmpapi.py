@@ -104,6 +104,10 @@ snmp_log_message._fields_ = [
 	("msg",                 ctypes.c_char_p)
 ]
 
+for f in [ libnsa.snmp_enable_calllog ]:
+	f.argtypes = None
+	f.restype = None
+
 # counter64 requires some extra work because it can't be reliably represented
 # by a single C data type
 class counter64(ctypes.Structure):
@@ -218,6 +222,15 @@ for f in [ libnsa.read_objid ]:
 	]
 	f.restype = ctypes.c_int
 
+for f in [ libnsa.snprint_objid ]:
+	f.argtypes = [
+		ctypes.c_char_p,                # char *buf
+		ctypes.c_size_t,                # size_t buf_len
+		c_oid_p,                        # const oid *objid
+		ctypes.c_size_t                 # size_t objidlen
+	]
+	f.restype = ctypes.c_int
+
 # include/net-snmp/agent/agent_handler.h
 HANDLER_CAN_GETANDGETNEXT               = 0x01
 HANDLER_CAN_SET                         = 0x02
@@ -551,6 +564,7 @@ for f in [ libnsX.netsnmp_table_dataset_remove_and_delete_row ]:
 		netsnmp_table_data_set_p,       # netsnmp_table_data_set *table
 		netsnmp_table_row_p             # netsnmp_table_row *row
 	]
+	f.restype = None
 
 # include/net-snmp/agent/snmp_agent.h
 for f in [ libnsa.agent_check_and_process ]:
@@ -648,7 +662,7 @@ for f in [ libnsX.snmp_pdu_create ]:
 
 #void            snmp_free_pdu( netsnmp_pdu *pdu);
 for f in [ libnsX.snmp_free_pdu ]:
-	f.argumets = [
+	f.argtypes = [
 		netsnmp_pdu_p
 	]
 	f.restype = None
@@ -656,13 +670,12 @@ for f in [ libnsX.snmp_free_pdu ]:
 # int snmp_add_var(netsnmp_pdu *pdu,
 #                  const oid * name, size_t name_length, char type, const char *value)
 for f in [ libnsX.snmp_add_var ]:
-	f.arguments = [
+	f.argtypes = [
 		netsnmp_pdu_p,   # netsnmp_pdu *pdu
 		c_oid_p,         # const oid *name
 		ctypes.c_size_t, # size_t name_length
 		ctypes.c_char,   # char type('=' to get type from OID tree)
 		ctypes.c_char_p  # const char *value
-		
 	]
 	f.restype = ctypes.c_int
 
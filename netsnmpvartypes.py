@@ -60,19 +60,25 @@ class _FixedSizeVarType(_VarType):
 		self._cvar.value = val
 
 class Integer32(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_INTEGER
 		self._ctype   = ctypes.c_long
 		super(Integer32, self).__init__(initval)
 
 class Unsigned32(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_UNSIGNED
 		self._ctype   = ctypes.c_ulong
 		super(Unsigned32, self).__init__(initval)
 
 class Counter32(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_COUNTER
 		self._ctype   = ctypes.c_ulong
 		super(Counter32, self).__init__(initval)
@@ -87,7 +93,9 @@ class Counter32(_FixedSizeVarType):
 		self.update(self.value() + count)
 
 class Counter64(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_COUNTER64
 		self._ctype   = counter64
 		super(Counter64, self).__init__(initval)
@@ -102,7 +110,9 @@ class Counter64(_FixedSizeVarType):
 		self.update(self.value() + count)
 
 class Gauge32(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_GAUGE
 		self._ctype   = ctypes.c_ulong
 		super(Gauge32, self).__init__(initval)
@@ -117,7 +127,9 @@ class Gauge32(_FixedSizeVarType):
 		self.update(self.value() + count)
 
 class TimeTicks(_FixedSizeVarType):
-	def __init__(self, initval = 0):
+	_default_initval = 0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_TIMETICKS
 		self._ctype   = ctypes.c_ulong
 		super(TimeTicks, self).__init__(initval)
@@ -125,7 +137,9 @@ class TimeTicks(_FixedSizeVarType):
 # RFC 2579 TruthValues should offer a bool interface to Python but
 # are stored as Integers using the special constants TV_TRUE and TV_FALSE
 class TruthValue(_FixedSizeVarType):
-	def __init__(self, initval = False):
+	_default_initval = False
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_INTEGER
 		self._ctype   = ctypes.c_int
 		super(TruthValue, self).__init__(TV_TRUE if initval else TV_FALSE)
@@ -140,7 +154,9 @@ class TruthValue(_FixedSizeVarType):
 			raise netsnmpAgentException("TruthValue must be True or False")
 
 class Float(_FixedSizeVarType):
-	def __init__(self, initval = 0.0):
+	_default_initval = 0.0
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_OPAQUE_FLOAT
 		self._ctype   = ctypes.c_float
 		super(Float, self).__init__(initval)
@@ -148,7 +164,9 @@ class Float(_FixedSizeVarType):
 # IP v4 addresses are stored as unsigned integers but we want the Python
 # interface to use strings.
 class IpAddress(_FixedSizeVarType):
-	def __init__(self, initval = "0.0.0.0"):
+	_default_initval = "0.0.0.0"
+
+	def __init__(self, initval = _default_initval):
 		self._asntype   = ASN_IPADDRESS
 		self._ctype     = ctypes.c_uint
 		super(IpAddress, self).__init__(0)
@@ -211,7 +229,9 @@ class _MaxSizeVarType(_VarType):
 		self._data_size = self._watcher.contents.data_size = len(val)
 
 class _String(_MaxSizeVarType):
-	def __init__(self, initval = ""):
+	_default_initval = ""
+
+	def __init__(self, initval = _default_initval):
 		self._asntype = ASN_OCTET_STR
 
 		# Note we can't use ctypes.c_char_p here since that creates an immutable
@@ -228,7 +248,9 @@ class _String(_MaxSizeVarType):
 # Whereas an OctetString can contain all byte values, a DisplayString is
 # restricted to ASCII characters only.
 class OctetString(_String):
-	def __init__(self, initval = ""):
+	_default_initval = ""
+
+	def __init__(self, initval = _default_initval):
 		super(OctetString, self).__init__(initval)
 		self._data_size = len(b(initval))
 
@@ -8,7 +8,7 @@
 # Integration tests for the netsnmpagent module (init behavior)
 #
 
-import sys, os, re, locale, time
+import sys, os, re, locale, time, ctypes
 from nose.tools import *
 sys.path.insert(1, "..")
 from netsnmptestenv import netsnmpTestEnv
@@ -87,6 +87,85 @@ def in_netsnmp_log(regexp):
 
 	return False
 
+@nottest
+def send_log_message(msgprio, msgtext):
+	""" Feeds a net-snmp log message directly to the agent's log handler. """
+
+	global agent
+
+	logmsg = netsnmpagent.snmp_log_message()
+	logmsg.priority = msgprio
+	logmsg.msg = msgtext
+	agent._log_handler(
+		netsnmpagent.SNMP_CALLBACK_LIBRARY,
+		netsnmpagent.SNMP_CALLBACK_LOGGING,
+		ctypes.addressof(logmsg),
+		None
+	)
+
+@timed(1)
+def test_UnrelatedWarningDoesNotFailConnection():
+	""" Unrelated warnings do not count as connection failures
+
+	While connecting for the first time, only log messages about failing to
+	connect to the master agent may mark the connection as failed, no matter
+	whether they are warnings or errors. Other warnings must be passed on to
+	the log handler instead. """
+
+	global agent
+
+	agent._status = netsnmpagent.netsnmpAgentStatus.FIRSTCONNECT
+	try:
+		send_log_message(netsnmpagent.LOG_WARNING, b"Warning: Something unrelated\n")
+		eq_(agent._status, netsnmpagent.netsnmpAgentStatus.FIRSTCONNECT)
+		ok_(in_netsnmp_log("^Something unrelated$") == True, "Warning was swallowed")
+
+		send_log_message(
+			netsnmpagent.LOG_WARNING,
+			b"Warning: Failed to connect to the agentx master agent (/nonexistant)\n"
+		)
+		eq_(agent._status, netsnmpagent.netsnmpAgentStatus.CONNECTFAILED)
+	finally:
+		agent._status = netsnmpagent.netsnmpAgentStatus.REGISTRATION
+
+@timed(1)
+def test_ParseNumericOIDWithoutMIBFiles():
+	""" Numeric OIDs get parsed with UseMIBFiles=False
+
+	With UseMIBFiles=False, OIDs are parsed as dotted numeric strings
+	without the help of net-snmp's MIB parser. We flip the attribute on our
+	agent instance just for this test since net-snmp only allows a single
+	agent per process. """
+
+	global agent
+
+	agent.UseMIBFiles = False
+	try:
+		(oid, oid_len) = agent._prepareOID("1.3.6.1.2.1.74.1.101.1.99")
+	finally:
+		agent.UseMIBFiles = True
+
+	eq_(list(oid), [1, 3, 6, 1, 2, 1, 74, 1, 101, 1, 99])
+	eq_(oid_len.value, 11)
+
+@timed(1)
+@raises(netsnmpagent.netsnmpAgentException)
+def test_SymbolicOIDWithoutMIBFilesFails():
+	""" Cached symbolic OIDs are rejected with UseMIBFiles=False
+
+	Parsing results get cached, but a symbolic OID prepared while MIB files
+	were in use must not be accepted anymore once UseMIBFiles is False. """
+
+	global agent
+
+	agent._prepareOID("TEST-MIB::testUnsigned32NoInitval.0")
+
+	agent.UseMIBFiles = False
+	try:
+		agent._prepareOID("TEST-MIB::testUnsigned32NoInitval.0")
+	finally:
+		agent.UseMIBFiles = True
+
 @timed(1)
 @raises(netsnmpTestEnv.MIBUnavailableError)
 def test_SecondGetFails():
@@ -8,7 +8,7 @@
 # Integration tests for the netsnmpagent module (SNMP objects)
 #
 
-import sys, os, re, subprocess, threading, signal, time
+import sys, os, re, subprocess, threading, signal, time, socket, struct
 from nose.tools import *
 sys.path.insert(1, "..")
 from netsnmptestenv import netsnmpTestEnv
@@ -18,6 +18,7 @@ def setUp(self):
 	global testenv, agent
 	global settableInteger32, settableUnsigned32, settableTimeTicks
 	global settableOctetString, settableDisplayString
+	global testTable, testTableNumber
 
 	testenv = netsnmpTestEnv()
 
@@ -364,6 +365,25 @@ def setUp(self):
 		initval = "A" * 256,
 	)
 
+	# Test table with a single Integer32 index
+	testTableNumber = agent.Unsigned32(
+		oidstr = "TEST-MIB::testTableNumber",
+	)
+
+	testTable = agent.Table(
+		oidstr     = "TEST-MIB::testTable",
+		indexes    = [
+			agent.Integer32(),
+		],
+		columns    = [
+			(2, agent.DisplayString("Unknown")),
+			(3, agent.Integer32(0)),
+			(4, agent.IpAddress("127.0.0.1")),
+			(5, agent.Counter64(0)),
+		],
+		counterobj = testTableNumber,
+	)
+
 	# Connect to master snmpd instance
 	agent.start()
 
@@ -1499,3 +1519,174 @@ def test_GET_SET_DisplayStringWithoutInterval_abcdef_eq_abcdef():
 	(data, datatype) = testenv.snmpget("TEST-MIB::testDisplayStringNoInitval.0")
 	eq_(datatype, "STRING")
 	eq_(data, "abcdef")
+
+@timed(1)
+def test_Table_addRows_adds_rows():
+	""" Table.addRows([[1], [2], [3]]) adds three rows
+
+	This tests that calling addRows() on a table with a list of three index
+	lists returns three TableRows whose cells can be set, that these rows
+	show up in the table's value() as well as through snmpget and that the
+	table's counter object was updated accordingly. """
+
+	global testenv, agent, testTable, testTableNumber
+
+	rows = testTable.addRows([
+		[ agent.Integer32(1) ],
+		[ agent.Integer32(2) ],
+		[ agent.Integer32(3) ],
+	])
+	eq_(len(rows), 3)
+	for (idx, row) in enumerate(rows, 1):
+		row.setRowCell(2, agent.DisplayString("row{0}".format(idx)))
+		row.setRowCell(3, agent.Integer32(idx * 10))
+		row.setRowCell(4, agent.IpAddress("192.168.0.{0}".format(idx)))
+		row.setRowCell(5, agent.Counter64(2**40 + idx))
+
+	tablevalue = testTable.value()
+	eq_(sorted(idx for idx in tablevalue if idx != 0), [1, 2, 3])
+	eq_(tablevalue[1], { 2: "row1", 3: 10, 4: "192.168.0.1", 5: 2**40 + 1 })
+	eq_(tablevalue[2], { 2: "row2", 3: 20, 4: "192.168.0.2", 5: 2**40 + 2 })
+	eq_(tablevalue[3], { 2: "row3", 3: 30, 4: "192.168.0.3", 5: 2**40 + 3 })
+	eq_(testTableNumber.value(), 3)
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableRowDesc.2")
+	eq_(datatype, "STRING")
+	eq_(data, "row2")
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableNumber.0")
+	eq_(datatype, "Gauge32")
+	eq_(int(data), 3)
+
+@timed(1)
+def test_Table_value_IpAddressAndCounter64Columns():
+	""" Table.value() for IpAddress and Counter64 columns
+
+	This tests that value() reports the defaults of IpAddress and Counter64
+	columns along with their types, that IP addresses stored in table cells
+	are formatted the same way as IpAddress.value() and
+	socket.inet_ntoa(struct.pack("I", ...)) do and that Counter64 values
+	exceeding 32 bits are returned in full. """
+
+	global testenv, agent, testTable
+
+	tablevalue = testTable.value()
+	eq_(tablevalue[0][4], { "type": "IPAddress", "value": "127.0.0.1" })
+	eq_(tablevalue[0][5], { "type": "Counter64", "value": 0 })
+
+	for idx in (1, 2, 3):
+		ipaddr = agent.IpAddress("192.168.0.{0}".format(idx))
+		expected = socket.inet_ntoa(struct.pack("I", ipaddr._cvar.value))
+		eq_(tablevalue[idx][4], expected)
+		eq_(tablevalue[idx][4], ipaddr.value())
+		eq_(tablevalue[idx][5], 2**40 + idx)
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableRowAddress.2")
+	eq_(datatype, "IpAddress")
+	eq_(data, "192.168.0.2")
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableRowCount.2")
+	eq_(datatype, "Counter64")
+	eq_(int(data), 2**40 + 2)
+
+@timed(1)
+def test_Table_getRow_Integer32Index():
+	""" Table.getRow(2) returns the row with index 2
+
+	This tests that getRow() finds a row of a table with a single Integer32
+	index both when passed an Integer32 SNMP object and a plain integer, and
+	that cells set through the returned TableRow become visible in the
+	table's value() and through snmpget. """
+
+	global testenv, agent, testTable
+
+	row = testTable.getRow([ agent.Integer32(2) ])
+	row.setRowCell(2, agent.DisplayString("second row"))
+
+	row = testTable.getRow(2)
+	row.setRowCell(3, agent.Integer32(22))
+
+	eq_(testTable.value()[2], { 2: "second row", 3: 22, 4: "192.168.0.2", 5: 2**40 + 2 })
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableRowDesc.2")
+	eq_(datatype, "STRING")
+	eq_(data, "second row")
+
+@timed(1)
+@raises(netsnmpagent.netsnmpAgentException)
+def test_Table_getRow_UnknownIndex_raises_Exception():
+	""" Table.getRow(42) raises an exception for a nonexisting row """
+
+	global testTable
+
+	testTable.getRow(42)
+
+@timed(1)
+def test_Table_setRowColumn_NewRow():
+	""" Table.setRowColumn(4, ...) on a just added row
+
+	This tests that setRowColumn() finds a row that was added with addRow()
+	after the table's rows have been looked up before. """
+
+	global testenv, agent, testTable, testTableNumber
+
+	testTable.addRow([ agent.Integer32(4) ])
+	testTable.setRowColumn(4, 2, agent.DisplayString("fourth row"))
+	testTable.setRowColumn(4, 3, agent.Integer32(40))
+
+	eq_(testTable.value()[4], { 2: "fourth row", 3: 40, 4: "127.0.0.1", 5: 0 })
+	eq_(testTableNumber.value(), 4)
+
+	(data, datatype) = testenv.snmpget("TEST-MIB::testTableRowValue.4")
+	eq_(datatype, "INTEGER")
+	eq_(int(data), 40)
+
+@timed(1)
+def test_Table_deleteRow():
+	""" Table.deleteRow(2) removes the row with index 2
+
+	This tests that deleteRow() removes the row with the given index only,
+	that the table's counter object gets decremented and that the row can
+	not be looked up anymore afterwards. """
+
+	global testenv, agent, testTable, testTableNumber
+
+	testTable.deleteRow(2)
+
+	eq_(sorted(idx for idx in testTable.value() if idx != 0), [1, 3, 4])
+	eq_(testTableNumber.value(), 3)
+	assert_raises(netsnmpagent.netsnmpAgentException, testTable.getRow, 2)
+	assert_raises(
+		netsnmpTestEnv.UnknownOIDError,
+		testenv.snmpget, "TEST-MIB::testTableRowDesc.2"
+	)
+
+	# The neighbouring rows must still be there
+	eq_(testTable.value()[3], { 2: "row3", 3: 30, 4: "192.168.0.3", 5: 2**40 + 3 })
+	testTable.setRowColumn(3, 3, agent.Integer32(33))
+	eq_(testTable.value()[3], { 2: "row3", 3: 33, 4: "192.168.0.3", 5: 2**40 + 3 })
+
+@timed(1)
+def test_Table_clear():
+	""" Table.clear() removes all rows
+
+	This tests that clear() removes every row of a table with several rows,
+	which requires it to advance to the next row only after having safely
+	stored the pointer to it before freeing the current row, and that the
+	table's counter object gets reset. """
+
+	global testenv, agent, testTable, testTableNumber
+
+	ok_(len(testTable.value()) > 2)
+
+	testTable.clear()
+
+	eq_(list(testTable.value().keys()), [0])
+	eq_(testTableNumber.value(), 0)
+	assert_raises(netsnmpagent.netsnmpAgentException, testTable.getRow, 1)
+
+	# The table must still be usable afterwards
+	testTable.addRow([ agent.Integer32(5) ])
+	testTable.setRowColumn(5, 2, agent.DisplayString("fifth row"))
+	eq_(testTable.value()[5], { 2: "fifth row", 3: 0, 4: "127.0.0.1", 5: 0 })
+	eq_(testTableNumber.value(), 1)